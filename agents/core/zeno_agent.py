@@ -34,6 +34,32 @@ from agents.workflows.morning_briefing import MorningBriefingWorkflow
 from tools.postcall import handle_call_end
 
 
+# Wake-word patterns, compiled once since they run on every user turn
+_SEPARATORS_RE = re.compile(r"[\s,;:._\-]+")
+_ZENO_PREFIX_RE = re.compile(r"^(hey\s+)?zeno\b\s*")
+_ZENO_VOCATIVE_RE = re.compile(r"^(?:hey\s+)?zeno\b\s*", re.IGNORECASE)
+
+# Control phrases, matched as substrings of the normalized utterance
+_ACTIVATION_PHRASES = (
+    "zeno in",
+    "come in",
+    "join",
+    "step in",
+    "hey zeno",
+    "wake",        # Added simple wake command
+    "wake up",     # Added wake up command
+)
+_DEACTIVATION_PHRASES = (
+    "zeno out",
+    "leave",
+    "dismiss",
+    "stand down",
+    "that's all",
+    "goodbye",
+    "stop",
+)
+
+
 @dataclass
 class ZenoState:
     """State management for Zeno agent sessions."""
@@ -150,58 +176,34 @@ Remember: You're here to make daily planning effortless and ensure users start e
     def _normalize(self, text: str) -> str:
         """Lowercase and collapse punctuation to spaces for robust matching."""
         t = text.lower()
-        t = re.sub(r"[\s,;:._\-]+", " ", t).strip()
+        t = _SEPARATORS_RE.sub(" ", t).strip()
         return t
 
-    def _is_activation(self, text: str) -> bool:
-        """Check if text contains Zeno activation phrases."""
-        t = self._normalize(text)
-        return any(
-            phrase in t
-            for phrase in [
-                "zeno in",
-                "come in",
-                "join",
-                "step in",
-                "hey zeno",
-                "wake",        # Added simple wake command
-                "wake up",     # Added wake up command
-            ]
-        )
+    def _is_activation(self, normalized: str) -> bool:
+        """Check if normalized text contains Zeno activation phrases."""
+        return any(phrase in normalized for phrase in _ACTIVATION_PHRASES)
 
-    def _is_deactivation(self, text: str) -> bool:
-        """Check if text contains Zeno deactivation phrases."""
-        t = self._normalize(text)
-        return any(
-            phrase in t
-            for phrase in [
-                "zeno out",
-                "leave",
-                "dismiss", 
-                "stand down",
-                "that's all",
-                "goodbye",
-                "stop",
-            ]
-        )
+    def _is_deactivation(self, normalized: str) -> bool:
+        """Check if normalized text contains Zeno deactivation phrases."""
+        return any(phrase in normalized for phrase in _DEACTIVATION_PHRASES)
 
-    def _extract_one_shot(self, text: str) -> Optional[str]:
-        """Extract one-shot command if present."""
+    def _extract_one_shot(self, normalized: str) -> Optional[str]:
+        """Extract one-shot command from normalized text if present."""
         # Accept variations like "Hey, Zeno -- do X", "Zeno: do X", "Zeno do X"
-        # Normalize punctuation and allow common misspellings
-        t = self._normalize(text)
+        # (punctuation is already collapsed by _normalize)
+        match = _ZENO_PREFIX_RE.match(normalized)
         # fast exit if zeno not present
-        if not re.match(r"^(hey\s+)?zeno\b", t):
+        if not match:
             return None
-        # strip the vocative prefix
-        tail = re.sub(r"^(hey\s+)?zeno\b\s*", "", t).strip()
-        if not tail or self._is_activation(text) or self._is_deactivation(text):
+        # strip the vocative prefix using the span we already matched
+        tail = normalized[match.end():].strip()
+        if not tail or self._is_activation(normalized) or self._is_deactivation(normalized):
             return None
         return tail
 
     def _maybe_strip_zeno_prefix(self, text: str) -> str:
         """Remove Zeno vocative prefix from text."""
-        return re.sub(r"^(?:hey\s+)?zeno\b\s*", "", text, flags=re.IGNORECASE)
+        return _ZENO_VOCATIVE_RE.sub("", text)
 
     @function_tool()
     async def switch_to_daily_planning(
@@ -262,8 +264,11 @@ Remember: You're here to make daily planning effortless and ensure users start e
         if not raw_text.strip():
             raise StopResponse()
 
+        # Normalize once; every phrase check below works on this form
+        normalized = self._normalize(raw_text)
+
         # 2) Handle deactivation phrases immediately
-        if self._is_deactivation(raw_text):
+        if self._is_deactivation(normalized):
             self.session.interrupt()
             user_data = getattr(self.session, "userdata", None)
             if user_data is not None:
@@ -276,13 +281,13 @@ Remember: You're here to make daily planning effortless and ensure users start e
 
         # 4) Support one-shot commands while idle (no persistent activation)
         if not assistant_is_active:
-            one_shot_tail = self._extract_one_shot(raw_text)
+            one_shot_tail = self._extract_one_shot(normalized)
             if one_shot_tail is not None:
                 new_message.content = [one_shot_tail]
                 return
 
         # 5) Handle activation phrases (arms assistant, no immediate reply)
-        if self._is_activation(raw_text):
+        if self._is_activation(normalized):
             if user_data is not None:
                 user_data.zeno_active = True  # type: ignore[attr-defined]
             raise StopResponse()
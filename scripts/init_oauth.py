@@ -14,7 +14,6 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from config.settings import get_settings
-from core.integrations.google.oauth import ensure_credentials
 
 
 def main():
@@ -69,6 +68,9 @@ def main():
         print("Please complete the authentication process.")
         print()
         
+        # Imported here so the missing-secrets path above doesn't pay for
+        # loading the Google API client stack.
+        from core.integrations.google.oauth import ensure_credentials
         credentials = ensure_credentials(scopes)
         
         print("✅ Google OAuth setup completed successfully!")
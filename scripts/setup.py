@@ -12,20 +12,102 @@ import shutil
 import subprocess
 
 
+GITIGNORE_CONTENT = b"""# Zeno Project .gitignore
+
+# Environment variables
+.env
+.env.local
+.env.production
+
+# Credentials and secrets
+credentials/
+*.key
+*.pem
+*.p8
+
+# Logs and data
+logs/
+data/
+*.log
+
+# Python
+__pycache__/
+*.py[cod]
+*$py.class
+*.so
+.Python
+build/
+develop-eggs/
+dist/
+downloads/
+eggs/
+.eggs/
+lib/
+lib64/
+parts/
+sdist/
+var/
+wheels/
+*.egg-info/
+.installed.cfg
+*.egg
+MANIFEST
+
+# Virtual environments
+venv/
+env/
+ENV/
+env.bak/
+venv.bak/
+
+# IDE
+.vscode/
+.idea/
+*.swp
+*.swo
+*~
+
+# OS
+.DS_Store
+.DS_Store?
+._*
+.Spotlight-V100
+.Trashes
+ehthumbs.db
+Thumbs.db
+
+# Database
+*.db
+*.sqlite
+*.sqlite3
+
+# Docker
+.dockerignore
+
+# Temporary files
+*.tmp
+*.temp
+.cache/
+
+# LiveKit
+*.room
+"""
+
+
 def create_directories():
     """Create necessary directories for Zeno."""
+    # Leaf directories only - makedirs creates logs/, data/ and deployment/
+    # along the way, so the parents don't need their own mkdir calls.
     directories = [
         "credentials",
-        "logs",
         "logs/transcripts",
-        "data",
         "data/tasks",
         "data/briefings",
         "deployment/ssl",
     ]
-    
+
     for directory in directories:
-        Path(directory).mkdir(parents=True, exist_ok=True)
+        os.makedirs(directory, exist_ok=True)
         print(f"✅ Created directory: {directory}")
 
 
@@ -35,10 +117,14 @@ def copy_legacy_credentials():
     new_credentials = Path("credentials")
     
     if legacy_credentials.exists():
-        for file in legacy_credentials.glob("*"):
-            if file.is_file():
-                shutil.copy2(file, new_credentials)
-                print(f"✅ Copied credential file: {file.name}")
+        # scandir reuses the d_type from readdir, so regular files are picked
+        # out without an extra stat per entry (symlinks are still followed,
+        # as before); copy2 uses sendfile on Linux.
+        with os.scandir(legacy_credentials) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    shutil.copy2(entry.path, new_credentials / entry.name)
+                    print(f"✅ Copied credential file: {entry.name}")
     else:
         print("ℹ️  No legacy credentials found to copy")
 
@@ -62,14 +148,15 @@ def install_dependencies():
     """Install Python dependencies."""
     try:
         print("📦 Installing Python dependencies...")
-        result = subprocess.run([
-            sys.executable, "-m", "pip", "install", "-r", "requirements.txt"
-        ], check=True, capture_output=True, text=True)
+        # pip output is streamed straight to the terminal rather than buffered
+        subprocess.run([
+            sys.executable, "-m", "pip", "install",
+            "--prefer-binary", "--disable-pip-version-check",
+            "-r", "requirements.txt"
+        ], check=True)
         print("✅ Dependencies installed successfully")
     except subprocess.CalledProcessError as e:
         print(f"❌ Error installing dependencies: {e}")
-        print(f"Output: {e.stdout}")
-        print(f"Error: {e.stderr}")
 
 
 def setup_google_oauth():
@@ -100,12 +187,23 @@ def check_environment():
         print("❌ .env file not found")
         return
     
-    missing_vars = []
+    # Parse the file once into a dict instead of rescanning it for every var
+    env_values = {}
     with open(env_file) as f:
-        env_content = f.read()
-        for var in required_vars:
-            if f"{var}=" not in env_content or f"{var}=your_" in env_content:
-                missing_vars.append(var)
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, value = line.split("=", 1)
+                key = key.strip()
+                # Accept shell-style "export VAR=value" lines
+                if key.startswith("export "):
+                    key = key[len("export "):].strip()
+                env_values[key] = value.strip()
+
+    missing_vars = [
+        var for var in required_vars
+        if not env_values.get(var) or env_values[var].startswith("your_")
+    ]
     
     if missing_vars:
         print("⚠️  The following environment variables need to be configured:")
@@ -118,90 +216,8 @@ def check_environment():
 
 def create_git_ignore():
     """Create or update .gitignore file."""
-    gitignore_content = """# Zeno Project .gitignore
-
-# Environment variables
-.env
-.env.local
-.env.production
-
-# Credentials and secrets
-credentials/
-*.key
-*.pem
-*.p8
-
-# Logs and data
-logs/
-data/
-*.log
-
-# Python
-__pycache__/
-*.py[cod]
-*$py.class
-*.so
-.Python
-build/
-develop-eggs/
-dist/
-downloads/
-eggs/
-.eggs/
-lib/
-lib64/
-parts/
-sdist/
-var/
-wheels/
-*.egg-info/
-.installed.cfg
-*.egg
-MANIFEST
-
-# Virtual environments
-venv/
-env/
-ENV/
-env.bak/
-venv.bak/
-
-# IDE
-.vscode/
-.idea/
-*.swp
-*.swo
-*~
-
-# OS
-.DS_Store
-.DS_Store?
-._*
-.Spotlight-V100
-.Trashes
-ehthumbs.db
-Thumbs.db
-
-# Database
-*.db
-*.sqlite
-*.sqlite3
-
-# Docker
-.dockerignore
-
-# Temporary files
-*.tmp
-*.temp
-.cache/
-
-# LiveKit
-*.room
-"""
-    
     gitignore_path = Path(".gitignore")
-    with open(gitignore_path, "w") as f:
-        f.write(gitignore_content)
+    gitignore_path.write_bytes(GITIGNORE_CONTENT)
     print("✅ Created/updated .gitignore file")
 
 
@@ -9,18 +9,25 @@ This script helps configure credentials, environment variables, and dependencies
 import os
 import sys
 import json
+import hashlib
+import importlib
 import subprocess
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Add project root to Python path
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# Hash of a requirements.txt that pip installed into this environment without
+# fixing a failing import probe. Kept under sys.prefix so it goes away with
+# the environment (a recreated venv, a different interpreter).
+SETUP_CACHE_FILE = Path(sys.prefix) / ".zeno_setup_cache"
 
-def create_env_template():
-    """Create a .env template file with all required variables."""
-    env_template = """# Zeno Voice Agent Configuration
+
+# File templates written by the setup steps below
+ENV_TEMPLATE = """# Zeno Voice Agent Configuration
 # Copy this file to .env and fill in your actual values
 
 # LiveKit Configuration (Required)
@@ -56,22 +63,8 @@ AGENT_PREEMPTIVE_GENERATION=false
 DEBUG=false
 ENVIRONMENT=development
 """
-    
-    env_file = PROJECT_ROOT / ".env.template"
-    with open(env_file, "w") as f:
-        f.write(env_template)
-    
-    print(f"✅ Created environment template: {env_file}")
-    return env_file
 
-
-def create_credentials_dir():
-    """Create credentials directory structure."""
-    creds_dir = PROJECT_ROOT / "credentials"
-    creds_dir.mkdir(exist_ok=True)
-    
-    # Create a README in credentials dir
-    readme_content = """# Credentials Directory
+CREDENTIALS_README = """# Credentials Directory
 
 This directory contains authentication credentials for Zeno.
 
@@ -101,10 +94,75 @@ credentials/
 
 Note: The token.json file will be created automatically after your first authentication.
 """
+
+ROOM_SCRIPT_TEMPLATE = '''#!/usr/bin/env python3
+"""
+Sample LiveKit Room Creator
+
+Creates a test room for Zeno voice agent development.
+"""
+
+import asyncio
+import os
+from livekit import api
+
+async def create_test_room():
+    """Create a test room for Zeno."""
+    # Load from environment
+    url = os.getenv("LIVEKIT_URL")
+    api_key = os.getenv("LIVEKIT_API_KEY")
+    api_secret = os.getenv("LIVEKIT_API_SECRET")
+    
+    if not all([url, api_key, api_secret]):
+        print("❌ LiveKit credentials not configured")
+        return
+    
+    # Create room
+    room_api = api.LiveKitAPI(url, api_key, api_secret)
+    
+    room_name = "zeno-test-room"
+    try:
+        room = await room_api.room.create_room(
+            api.CreateRoomRequest(name=room_name, empty_timeout=300, max_participants=2)
+        )
+        print(f"✅ Created test room: {room.name}")
+        print(f"   Room SID: {room.sid}")
+        
+        # Create participant token
+        token = api.AccessToken(api_key, api_secret)
+        token.with_identity("user")
+        token.with_name("Test User")
+        token.with_grants(api.VideoGrants(room_join=True, room=room_name))
+        
+        jwt_token = token.to_jwt()
+        print(f"   User token: {jwt_token}")
+        print(f"   Join URL: {url}/room/{room_name}?token={jwt_token}")
+        
+    except Exception as e:
+        print(f"❌ Failed to create room: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(create_test_room())
+'''
+
+
+def create_env_template():
+    """Create a .env template file with all required variables."""
+    env_file = PROJECT_ROOT / ".env.template"
+    env_file.write_text(ENV_TEMPLATE, encoding="utf-8")
+    
+    print(f"✅ Created environment template: {env_file}")
+    return env_file
+
+
+def create_credentials_dir():
+    """Create credentials directory structure."""
+    creds_dir = PROJECT_ROOT / "credentials"
+    creds_dir.mkdir(exist_ok=True)
     
+    # Create a README in credentials dir
     readme_file = creds_dir / "README.md"
-    with open(readme_file, "w") as f:
-        f.write(readme_content)
+    readme_file.write_text(CREDENTIALS_README, encoding="utf-8")
     
     print(f"✅ Created credentials directory: {creds_dir}")
     return creds_dir
@@ -116,38 +174,44 @@ def create_logs_dir():
     logs_dir.mkdir(exist_ok=True)
     
     # Create subdirectories
-    (logs_dir / "transcripts").mkdir(exist_ok=True)
-    (logs_dir / "summaries").mkdir(exist_ok=True)
-    (logs_dir / "agent").mkdir(exist_ok=True)
+    for subdir in ("transcripts", "summaries", "agent"):
+        (logs_dir / subdir).mkdir(exist_ok=True)
     
     print(f"✅ Created logs directory: {logs_dir}")
     return logs_dir
 
 
+def _probe_import(module_name: str) -> Optional[Exception]:
+    """Import a module, returning the exception if it fails (None on success)."""
+    try:
+        importlib.import_module(module_name)
+        return None
+    except Exception as e:
+        return e
+
+
 def check_dependencies():
     """Check if required dependencies are installed."""
     print("🔍 Checking dependencies...")
     
-    try:
-        import livekit
-        print("   ✅ LiveKit SDK")
-    except ImportError:
-        print("   ❌ LiveKit SDK - run: pip install -r requirements.txt")
-        return False
-    
-    try:
-        import openai
-        print("   ✅ OpenAI")
-    except ImportError:
-        print("   ❌ OpenAI - run: pip install openai")
-        return False
+    # (module, display name, install hint)
+    probes = [
+        ("livekit", "LiveKit SDK", "pip install -r requirements.txt"),
+        ("openai", "OpenAI", "pip install openai"),
+        ("google.oauth2.credentials", "Google API Client", "pip install google-auth google-api-python-client"),
+    ]
     
-    try:
-        from google.oauth2.credentials import Credentials
-        print("   ✅ Google API Client")
-    except ImportError:
-        print("   ❌ Google API Client - run: pip install google-auth google-api-python-client")
-        return False
+    for module, name, hint in probes:
+        error = _probe_import(module)
+        if error is None:
+            print(f"   ✅ {name}")
+        elif isinstance(error, ImportError):
+            print(f"   ❌ {name} - run: {hint}")
+            return False
+        else:
+            # Installed but broken on import - report it rather than calling it missing
+            print(f"   ❌ {name} - failed to import ({type(error).__name__}: {error})")
+            return False
     
     return True
 
@@ -161,25 +225,65 @@ def install_requirements():
         return False
     
     print("📦 Installing dependencies...")
+    # Relay pip's output as it arrives rather than buffering all of it
+    with subprocess.Popen([
+        sys.executable, "-m", "pip", "install", "-r", str(requirements_file)
+    ], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1, text=True) as proc:
+        for line in proc.stdout:
+            sys.stdout.write(f"   {line}")
+    
+    if proc.returncode != 0:
+        print(f"   ❌ Failed to install dependencies (pip exited with {proc.returncode})")
+        return False
+    
+    print("   ✅ Dependencies installed successfully")
+    return True
+
+
+@lru_cache(maxsize=1)
+def _load_env() -> bool:
+    """Load the project .env into the environment once per process."""
+    env_file = PROJECT_ROOT / ".env"
+    # Only read regular files - opening a FIFO or device at .env would block
+    if not env_file.is_file():
+        return False
+
+    from dotenv import load_dotenv
+    return load_dotenv(env_file)
+
+
+def _requirements_hash() -> Optional[str]:
+    """Hash requirements.txt, or return None if it is missing."""
+    requirements_file = PROJECT_ROOT / "requirements.txt"
+    if not requirements_file.is_file():
+        return None
+    return hashlib.blake2b(requirements_file.read_bytes(), digest_size=16).hexdigest()
+
+
+def _pip_already_failed_to_fix(requirements_hash: str) -> bool:
+    """Check whether pip already installed this requirements.txt here and imports still failed."""
     try:
-        subprocess.run([
-            sys.executable, "-m", "pip", "install", "-r", str(requirements_file)
-        ], check=True, capture_output=True, text=True)
-        print("   ✅ Dependencies installed successfully")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"   ❌ Failed to install dependencies: {e}")
-        print(f"   Error output: {e.stderr}")
+        return SETUP_CACHE_FILE.read_text().strip() == requirements_hash
+    except OSError:
         return False
 
 
+def _record_unfixed_install(requirements_hash: Optional[str]) -> None:
+    """Remember (best effort) that installing this requirements.txt didn't fix the imports."""
+    if not requirements_hash:
+        return
+    try:
+        SETUP_CACHE_FILE.write_text(requirements_hash)
+    except OSError as e:
+        print(f"   ⚠️  Could not write {SETUP_CACHE_FILE}: {e}")
+
+
 def validate_livekit_config():
     """Validate LiveKit configuration."""
     print("🔍 Validating LiveKit configuration...")
     
     # Load environment variables
-    from dotenv import load_dotenv
-    load_dotenv()
+    _load_env()
     
     livekit_url = os.getenv("LIVEKIT_URL")
     livekit_key = os.getenv("LIVEKIT_API_KEY")
@@ -196,59 +300,8 @@ def validate_livekit_config():
 
 def create_sample_room_script():
     """Create a sample script for testing LiveKit rooms."""
-    script_content = '''#!/usr/bin/env python3
-"""
-Sample LiveKit Room Creator
-
-Creates a test room for Zeno voice agent development.
-"""
-
-import asyncio
-import os
-from livekit import api
-
-async def create_test_room():
-    """Create a test room for Zeno."""
-    # Load from environment
-    url = os.getenv("LIVEKIT_URL")
-    api_key = os.getenv("LIVEKIT_API_KEY")
-    api_secret = os.getenv("LIVEKIT_API_SECRET")
-    
-    if not all([url, api_key, api_secret]):
-        print("❌ LiveKit credentials not configured")
-        return
-    
-    # Create room
-    room_api = api.LiveKitAPI(url, api_key, api_secret)
-    
-    room_name = "zeno-test-room"
-    try:
-        room = await room_api.room.create_room(
-            api.CreateRoomRequest(name=room_name, empty_timeout=300, max_participants=2)
-        )
-        print(f"✅ Created test room: {room.name}")
-        print(f"   Room SID: {room.sid}")
-        
-        # Create participant token
-        token = api.AccessToken(api_key, api_secret)
-        token.with_identity("user")
-        token.with_name("Test User")
-        token.with_grants(api.VideoGrants(room_join=True, room=room_name))
-        
-        jwt_token = token.to_jwt()
-        print(f"   User token: {jwt_token}")
-        print(f"   Join URL: {url}/room/{room_name}?token={jwt_token}")
-        
-    except Exception as e:
-        print(f"❌ Failed to create room: {e}")
-
-if __name__ == "__main__":
-    asyncio.run(create_test_room())
-'''
-    
     script_file = PROJECT_ROOT / "create_test_room.py"
-    with open(script_file, "w") as f:
-        f.write(script_content)
+    script_file.write_text(ROOM_SCRIPT_TEMPLATE, encoding="utf-8")
     
     # Make executable
     os.chmod(script_file, 0o755)
@@ -257,6 +310,15 @@ if __name__ == "__main__":
     return script_file
 
 
+def _entry_names(directory: Path) -> set:
+    """Return the names of all entries in a directory (empty if unreadable)."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+
 def main():
     """Run the setup process."""
     print("🤖 Zeno Voice Agent Setup")
@@ -280,12 +342,22 @@ def main():
     else:
         print(f"✅ Found existing .env file: {env_file}")
     
-    # Install dependencies
+    # Install dependencies. pip is skipped only if it already ran successfully
+    # for this exact requirements.txt in this environment and the imports
+    # still failed afterwards - reinstalling the same set won't fix that.
     if not check_dependencies():
-        print("\n📦 Installing dependencies...")
-        if not install_requirements():
-            print("❌ Failed to install dependencies. Please run: pip install -r requirements.txt")
-            return
+        requirements_hash = _requirements_hash()
+        if requirements_hash and _pip_already_failed_to_fix(requirements_hash):
+            print("\n⚠️  pip already installed this requirements.txt here without fixing the import above")
+            print("   Skipping a repeat install - check the error above")
+        else:
+            print("\n📦 Installing dependencies...")
+            if not install_requirements():
+                print("❌ Failed to install dependencies. Please run: pip install -r requirements.txt")
+                return
+            importlib.invalidate_caches()
+            if not check_dependencies():
+                _record_unfixed_install(requirements_hash)
     
     # Create test scripts
     create_sample_room_script()
@@ -294,26 +366,25 @@ def main():
     print("\n🔧 Setup Summary:")
     print("=" * 40)
     
+    # One directory listing per level instead of a stat call per path
+    root_entries = _entry_names(PROJECT_ROOT)
+    logs_entries = _entry_names(PROJECT_ROOT / "logs") if "logs" in root_entries else set()
+    
     directories = [
-        PROJECT_ROOT / "credentials",
-        PROJECT_ROOT / "logs",
-        PROJECT_ROOT / "logs" / "transcripts"
+        (PROJECT_ROOT / "credentials", "credentials" in root_entries),
+        (PROJECT_ROOT / "logs", "logs" in root_entries),
+        (PROJECT_ROOT / "logs" / "transcripts", "transcripts" in logs_entries)
     ]
     
-    for directory in directories:
-        status = "✅" if directory.exists() else "❌"
+    for directory, exists in directories:
+        status = "✅" if exists else "❌"
         print(f"{status} {directory}")
     
-    files = [
-        PROJECT_ROOT / ".env.template",
-        PROJECT_ROOT / "requirements.txt",
-        PROJECT_ROOT / "run_voice_agent.py",
-        PROJECT_ROOT / "create_test_room.py"
-    ]
+    files = [".env.template", "requirements.txt", "run_voice_agent.py", "create_test_room.py"]
     
-    for file in files:
-        status = "✅" if file.exists() else "❌"
-        print(f"{status} {file}")
+    for name in files:
+        status = "✅" if name in root_entries else "❌"
+        print(f"{status} {PROJECT_ROOT / name}")
     
     print("\n🚀 Ready to start!")
     print("Next: Configure your .env file and run the voice agent")
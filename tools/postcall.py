@@ -6,13 +6,54 @@ Enhanced call summary and transcript processing with Zeno-specific features.
 
 import os
 import json
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 
-from core.integrations.google.drive import DriveService
-from core.integrations.google.gmail import GmailService
 from config.settings import get_settings
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json encoder
+    orjson = None
+
+# Disk and network work after a call (transcript writes, OpenAI/Google
+# calls) runs here so handle_call_end returns without blocking teardown
+_io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="postcall-io")
+
+
+def _submit_background(label, fn, *args):
+    """Queue post-call work on the I/O pool, logging when it is queued and when it ends."""
+    print(f"⏳ Queued {label}")
+    future = _io_pool.submit(fn, *args)
+    future.add_done_callback(lambda f: _log_background_result(label, f))
+    return future
+
+
+def _log_background_result(label, future):
+    """Report how a background post-call job ended.
+
+    Jobs that handle their own errors report their own outcome, so a clean
+    return is only logged as "ended", not as a success.
+    """
+    if future.cancelled():
+        print(f"⚠️  {label} was cancelled before it ran")
+        return
+    exc = future.exception()
+    if exc is not None:
+        print(f"❌ {label} failed: {exc}")
+        traceback.print_exception(type(exc), exc, exc.__traceback__)
+    else:
+        print(f"ℹ️  {label} ended")
+
+
+def _history_items(agent_session):
+    """Return the session's chat history items, or an empty tuple if there are none."""
+    history = getattr(agent_session, 'history', None)
+    return history.items if history and history.items else ()
+
 
 def handle_call_end(agent_session, participant):
     """
@@ -21,7 +62,13 @@ def handle_call_end(agent_session, participant):
     Args:
         agent_session: The agent session that ended
         participant: The participant who disconnected
+    
+    Returns:
+        Futures for the background post-call work (transcript write and summary).
+        Callers should wait on them, e.g. from a job shutdown callback, so the
+        work isn't dropped if the process is torn down.
     """
+    pending = []
     print(f"Call has ended for participant {participant.identity} - performing Zeno cleanup 🤖")
     
     # Reset assistant state to ensure clean state for next connection
@@ -35,65 +82,75 @@ def handle_call_end(agent_session, participant):
     # Extract conversation transcript
     try:
         # Use the history property instead of chat_ctx
-        chat_ctx = agent_session.history
-        if chat_ctx and chat_ctx.items:
-            print("Extracting call transcript...")
-            
-            transcript = []
-            conversation_text = ""
+        items = _history_items(agent_session)
+        if not items:
+            print("No chat history available for transcript.")
+            return pending
+        
+        print("Extracting call transcript...")
+        
+        transcript = []
+        conversation_lines = []
+        # Display times kept alongside (not in) the saved transcript
+        time_strs = []
+        
+        for item in items:
+            # Only process ChatMessage items (function calls etc. have no role)
+            role = getattr(item, 'role', None)
+            if role is None:
+                continue
+            content = getattr(item, 'text_content', None) or ""
+            timestamp = getattr(item, 'created_at', None)
             
-            for item in chat_ctx.items:
-                # Only process ChatMessage items (exclude function calls, etc.)
-                if hasattr(item, 'role') and hasattr(item, 'text_content'):
-                    role = item.role
-                    content = item.text_content or ""
-                    timestamp = getattr(item, 'created_at', None)
-                    
-                    transcript.append({
-                        "role": role,
-                        "content": content,
-                        "timestamp": timestamp
-                    })
-                    
-                    # Build conversation text for AI processing
-                    speaker = "User" if role == 'user' else "Zeno"
-                    conversation_text += f"{speaker}: {content}\n"
+            transcript.append({
+                "role": role,
+                "content": content,
+                "timestamp": timestamp
+            })
+            time_strs.append(
+                time.strftime('%H:%M:%S', time.localtime(timestamp)) if timestamp else "N/A"
+            )
             
-            # Only process transcript if there were actual messages
-            if transcript:
-                # Print complete transcript to console
-                print("\n" + "="*60)
-                print(f"ZENO CALL TRANSCRIPT - Participant: {participant.identity}")
-                print("="*60)
-                
-                for i, msg in enumerate(transcript, 1):
-                    role_display = "🎤 USER" if msg['role'] == 'user' else "🤖 ZENO"
-                    if msg['timestamp']:
-                        timestamp_str = datetime.fromtimestamp(msg['timestamp']).strftime('%H:%M:%S')
-                    else:
-                        timestamp_str = "N/A"
-                    print(f"\n[{i:2d}] {role_display} ({timestamp_str}):")
-                    print(f"     {msg['content']}")
-                
-                print("\n" + "="*60)
-                print(f"Total messages: {len(transcript)}")
-                print("="*60 + "\n")
-                
-                # Save transcript to file
-                save_transcript(transcript, participant.identity)
-                
-                # Generate post-call summary and actions if there's meaningful conversation
-                if len(transcript) > 1:  # More than just initial greeting
-                    print("Generating post-call summary and actions...")
-                    generate_post_call_summary_and_actions(conversation_text, participant.identity)
-            else:
-                print("No conversation messages to transcript.")
-        else:
-            print("No chat history available for transcript.")
+            # Build conversation text for AI processing
+            speaker = "User" if role == 'user' else "Zeno"
+            conversation_lines.append(f"{speaker}: {content}\n")
+        
+        # Only process transcript if there were actual messages
+        if not transcript:
+            print("No conversation messages to transcript.")
+            return pending
+        
+        conversation_text = "".join(conversation_lines)
+        
+        # Print complete transcript to console
+        print("\n" + "="*60)
+        print(f"ZENO CALL TRANSCRIPT - Participant: {participant.identity}")
+        print("="*60)
+        
+        for i, (msg, timestamp_str) in enumerate(zip(transcript, time_strs), 1):
+            role_display = "🎤 USER" if msg['role'] == 'user' else "🤖 ZENO"
+            print(f"\n[{i:2d}] {role_display} ({timestamp_str}):")
+            print(f"     {msg['content']}")
+        
+        print("\n" + "="*60)
+        print(f"Total messages: {len(transcript)}")
+        print("="*60 + "\n")
+        
+        # Save transcript to file
+        pending.append(save_transcript(transcript, participant.identity))
+        
+        # Generate post-call summary and actions if there's meaningful conversation
+        if len(transcript) > 1:  # More than just initial greeting
+            print("Generating post-call summary and actions...")
+            pending.append(_submit_background(
+                f"post-call summary for {participant.identity}",
+                generate_post_call_summary_and_actions, conversation_text, participant.identity
+            ))
     except Exception as e:
         print(f"Error extracting transcript: {e}")
-        import traceback
         traceback.print_exc()
+    
+    return pending
 
 
 def generate_post_call_summary_and_actions(conversation_text: str, participant_id: str):
@@ -110,7 +167,10 @@ def generate_post_call_summary_and_actions(conversation_text: str, participant_i
             print("   To enable post-call summaries, add your Google OAuth credentials.")
             return
         
-        # Initialize services
+        # Initialize services (imported here so loading this module doesn't
+        # pull in the Google API client stack for every agent process)
+        from core.integrations.google.drive import DriveService
+        from core.integrations.google.gmail import GmailService
         drive_service = DriveService()
         gmail_service = GmailService()
         
@@ -118,48 +178,63 @@ def generate_post_call_summary_and_actions(conversation_text: str, participant_i
         import openai as openai_lib
         openai_client = openai_lib.OpenAI()
         
-        # Generate summary using OpenAI
-        summary_prompt = f"""
-        Please analyze this phone conversation with Zeno AI assistant and provide:
-        1. A concise summary of what was discussed
-        2. Key outcomes or decisions made
-        3. Important information exchanged
-        4. Any tasks or action items mentioned
+        # Generate summary and to-do items in a single OpenAI call, so the
+        # conversation is only sent (and billed) once
+        analysis_prompt = f"""
+        Please analyze this phone conversation with Zeno AI assistant.
         
-        Conversation:
-        {conversation_text}
-        
-        Please be concise but capture the essential points.
-        """
-        
-        summary_response = openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": summary_prompt}],
-            max_tokens=500,
-            temperature=0.3
-        )
-        
-        call_summary = summary_response.choices[0].message.content.strip()
-        
-        # Generate to-do items using OpenAI
-        todo_prompt = f"""
-        Based on this phone conversation with Zeno AI assistant, extract any action items, tasks, or follow-ups that need to be done.
-        Format as a simple bulleted list. If no clear action items exist, respond with "No specific action items identified."
+        Respond with a JSON object with exactly two string fields:
+        - "summary": a concise summary covering what was discussed, key outcomes or
+          decisions made, important information exchanged, and any tasks mentioned.
+          Be concise but capture the essential points.
+        - "action_items": any action items, tasks, or follow-ups that need to be done,
+          formatted as a simple bulleted list. If no clear action items exist, use
+          "No specific action items identified."
         
         Conversation:
         {conversation_text}
-        
-        Action items:
         """
         
-        todo_response = openai_client.chat.completions.create(
+        analysis_response = openai_client.chat.completions.create(
             model="gpt-4o-mini",
-            messages=[{"role": "user", "content": todo_prompt}],
-            max_tokens=300,
+            messages=[{"role": "user", "content": analysis_prompt}],
+            response_format={"type": "json_object"},
+            max_tokens=800,
             temperature=0.3
         )
         
-        todo_items = todo_response.choices[0].message.content.strip()
+        choice = analysis_response.choices[0]
+        raw_analysis = choice.message.content or ""
+        analysis = None
+        truncated = choice.finish_reason == "length"
+        if truncated:
+            # Half a JSON object is no use as a summary, so don't fall back to it
+            print("⚠️  Post-call analysis was cut off at max_tokens; no summary available")
+        else:
+            try:
+                analysis = json.loads(raw_analysis)
+            except (json.JSONDecodeError, TypeError) as e:
+                print(f"⚠️  Could not parse post-call analysis as JSON ({e}); using raw text as the summary")
+            else:
+                if not isinstance(analysis, dict):
+                    print("⚠️  Post-call analysis was not a JSON object; using raw text as the summary")
+        
+        if isinstance(analysis, dict):
+            summary = analysis.get("summary")
+            # A null, non-string or blank summary counts as missing
+            call_summary = summary.strip() if isinstance(summary, str) else ""
+            call_summary = call_summary or "Summary unavailable."
+            todo_items = analysis.get("action_items") or "No specific action items identified."
+            if isinstance(todo_items, list):
+                todo_items = "\n".join(f"- {item}" for item in todo_items)
+            todo_items = str(todo_items).strip()
+        elif truncated:
+            call_summary = "Summary unavailable (the AI response was cut off)."
+            todo_items = "No specific action items identified."
+        else:
+            # Still produce the doc and email from whatever the model returned
+            call_summary = raw_analysis.strip() or "Summary unavailable."
+            todo_items = "No specific action items identified."
         
         # Create Google Doc with summary and to-dos using the new service
         date_str = datetime.now().strftime('%Y-%m-%d %H:%M')
@@ -207,17 +282,13 @@ Zeno AI Assistant
             
     except Exception as e:
         print(f"❌ Error generating post-call summary and actions: {e}")
-        import traceback
         traceback.print_exc()
 
 
 def save_transcript(transcript, participant_id):
-    """Save the conversation transcript to a JSON file."""
+    """Save the conversation transcript to a JSON file in the background."""
     settings = get_settings()
-    
-    # Create transcripts directory
     transcripts_dir = settings.logs_dir / "transcripts"
-    transcripts_dir.mkdir(parents=True, exist_ok=True)
     
     # Generate filename
     filename = f"transcript_{participant_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -237,7 +308,24 @@ def save_transcript(transcript, participant_id):
         }
     }
     
-    with open(filepath, 'w') as f:
-        json.dump(transcript_data, f, indent=2)
+    return _submit_background(f"transcript write for {participant_id}", _write_transcript, transcript_data, filepath)
+
+
+def _write_transcript(transcript_data, filepath):
+    """Write transcript data to disk (runs on the postcall I/O pool).
+
+    Errors propagate to the future, where _log_background_result reports them.
+    """
+    # Create transcripts directory
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    
+    if orjson is not None:
+        filepath.write_bytes(
+            orjson.dumps(transcript_data, option=orjson.OPT_INDENT_2)
+        )
+    else:
+        # Match the orjson output: UTF-8 with non-ASCII left unescaped
+        with open(filepath, 'w', encoding="utf-8") as f:
+            json.dump(transcript_data, f, indent=2, ensure_ascii=False)
     
     print(f"📝 Transcript saved to {filepath}")